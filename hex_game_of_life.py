@@ -9,36 +9,62 @@ Example
 >>> Grid()
 And you're all good to go! Too easy.
 
-Possible changes
-----------------
-- I think I need to implement threading (oh no) to make this work the way I 
-  want so GUI doesn't constantly freeze up.
+While animating, each frame is worked out on a worker thread while the last
+one is being drawn, so the GUI doesn't freeze up.
 """
 import os
 import logging
+import logging.handlers
+import atexit
+import contextlib
 import tkinter as tk
-from math import cos, sin, floor, sqrt, pi
-import random
+from math import cos, sin, floor, pi
 import time
-import threading
 import queue
 import concurrent.futures
 
-# Change cwd to that of script
-path_to_script = os.path.abspath(__file__)
-name_of_script = os.path.basename(__file__)
-os.chdir(os.path.dirname(path_to_script))
-
-# Setting up logger
+import numpy as np
+try:
+    import numba
+except ImportError: # Numba is optional, hex_step() falls back to NumPy
+    numba = None
+else:
+    # hex_step() is only ever called from Grid.stepper's thread. With TBB 
+    # (which Numba prefers if it's installed) running a parallel kernel off 
+    # the main thread leaves the interpreter hanging at exit, so use Numba's
+    # own workqueue pool instead. That aborts if two threads call a kernel at
+    # once, which can't happen as steps all go through the one thread.
+    numba.config.THREADING_LAYER = 'workqueue'
+
+# Setting up logger. Its handlers are only added by main(), so importing this 
+# module doesn't touch the log file.
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
-basename, ext = os.path.splitext(name_of_script) # Separates basename and extension (i.e. '.py')
-file_handler = logging.FileHandler(basename + '.log') # Naming log file same as script
-formatter = logging.Formatter("%(asctime)s:%(name)s:%(levelname)s:%(message)s")
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+logger.propagate = False # Only our own handler, not the root's too
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that only works out the date and time once per second, 
+    rather than once per record. Otherwise formats times like 
+    logging.Formatter, i.e. milliseconds are only added on when there's no
+    `datefmt`."""
+    last_key = None
+    last_time = ''
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        if (second, datefmt) != self.last_key:
+            self.last_key = (second, datefmt)
+            self.last_time = time.strftime(datefmt or self.default_time_format, 
+                self.converter(second))
+        if datefmt or not self.default_msec_format:
+            return self.last_time
+        return self.default_msec_format % (self.last_time, record.msecs)
+
+
+# Shared by every handler that needs a formatter, so the format is parsed once
+LOG_FORMATTER = CachedTimeFormatter("%(asctime)s:%(name)s:%(levelname)s:%(message)s")
 
-logger.info(msg=f"Started running {name_of_script}")
 ############################# MAIN CODE STARTS HERE #############################
 
 COLOUR_SCHEMES = {
@@ -64,48 +90,303 @@ COLOUR_SCHEMES = {
     }
 }
 
+# Offsets (dx, dy) from a Hexagon to each of its 6 neighbours. Odd rows are
+# drawn shifted half a Hexagon to the right of even rows, so which Hexagons
+# touch depends on the row's parity. Arrays of shape (6, 2), so they're ready
+# to broadcast against coordinates without converting them each time.
+EVEN_ROW_OFFSETS = np.array(
+    ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0)), dtype=np.int8)
+ODD_ROW_OFFSETS = np.array(
+    ((-1, 0), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)), dtype=np.int8)
+EVEN_ROW_OFFSETS.setflags(write=False)
+ODD_ROW_OFFSETS.setflags(write=False)
+
+
+def neighbour_indices(shape):
+    """Returns np.int32 array of shape (H, W, 6) holding, for each cell [y, x]
+    of a grid of the given shape, the flat indices (i.e. y*W + x) of its 6
+    neighbours into the raveled grid.
+
+    Neighbours wrap around the edges of the grid, i.e. the right-most column
+    neighbours the left-most one, and likewise for the top and bottom rows.
+    """
+    H, W = shape
+    ys, xs = np.indices(shape)
+    # Pick each cell's offset table by the parity of its row; shape (H, W, 6, 2)
+    odd_row = (ys % 2 == 1)[:, :, None, None]
+    offsets = np.where(odd_row, ODD_ROW_OFFSETS, EVEN_ROW_OFFSETS)
+    neighbour_xs = (xs[:, :, None] + offsets[..., 0]) % W
+    neighbour_ys = (ys[:, :, None] + offsets[..., 1]) % H
+
+    return (neighbour_ys * W + neighbour_xs).astype(np.int32)
+
+
+# The game's rules as a lookup table: NEXT_STATE[(state << 3) | count] is a 
+# cell's next state given its current state and live neighbour count. Born 
+# with exactly 3 live neighbours, survives with 2 or 3, otherwise dead.
+NEXT_STATE = np.zeros(16, dtype=np.uint8)
+NEXT_STATE[(0 << 3) | 3] = 1
+NEXT_STATE[(1 << 3) | 2] = 1
+NEXT_STATE[(1 << 3) | 3] = 1
+NEXT_STATE.setflags(write=False) # Numba bakes it into compiled code as is
+
+
+def bitboard_step(state, out):
+    """Writes the next frame of `state` into `out`, both np.uint8 arrays of
+    the same shape.
+
+    The state is packed into bitboards (see pack_rows()) so that each 
+    bitwise operation below works on 64 cells at once. The 6 neighbour
+    bitboards are summed with full adders into 3 bit planes, s0 + 2*s1 + 
+    4*s2, and the rules are applied to those planes directly. This is 
+    hex_step() when Numba isn't installed.
+    """
+    if state.size == 0: # No words to shift bits between
+        return
+
+    W = state.shape[1]
+    rows = pack_rows(state)
+    up = np.roll(rows, 1, axis=0) # up[y] = rows[y-1]
+    down = np.roll(rows, -1, axis=0) # down[y] = rows[y+1]
+
+    # Neighbours to the left/right of the row above/below are the only
+    # ones that depend on the row's parity (see EVEN/ODD_ROW_OFFSETS)
+    odd_row = (np.arange(len(rows)) % 2 == 1)[:, None]
+    up_diagonal = np.where(odd_row, shift_from_right(up, W), shift_from_left(up, W))
+    down_diagonal = np.where(odd_row, shift_from_right(down, W), shift_from_left(down, W))
+
+    sum_a, carry_a = full_add(up_diagonal, shift_from_left(rows, W), down_diagonal)
+    sum_b, carry_b = full_add(up, down, shift_from_right(rows, W))
+    s0 = sum_a ^ sum_b
+    s1, s2 = full_add(carry_a, carry_b, sum_a & sum_b)
+
+    # Born with exactly 3 live neighbours (s0=1, s1=1, s2=0), survives 
+    # with 2 or 3 (s1=1, s2=0)
+    out[...] = unpack_rows(s1 & ~s2 & (s0 | rows), W)
+
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True, nogil=True)
+    def hex_step(state, out):
+        """Writes the next frame of `state` into `out`, both np.uint8 arrays of
+        the same shape. Counts neighbours and applies the game's rules in a 
+        single pass, with rows shared out between cores. Doesn't hold the GIL,
+        so tkinter keeps running while it's called from another thread.
+
+        The six neighbour reads are written out by hand (see EVEN_ROW_OFFSETS
+        and ODD_ROW_OFFSETS), with one copy of the inner loop per row parity, 
+        so there's no offset table lookup or parity check per cell.
+        """
+        H, W = state.shape
+        for y in numba.prange(H):
+            # Offsets are never more than 1, so a neighbour can only be one 
+            # row/column past an edge. Wrapping it back with a compare (which
+            # compiles to a select) avoids dividing like % would.
+            up = y - 1 if y > 0 else H - 1
+            down = y + 1 if y < H - 1 else 0
+            if y % 2 == 0:
+                for x in range(W):
+                    left = x - 1 if x > 0 else W - 1
+                    right = x + 1 if x < W - 1 else 0
+                    n = (state[up, left] + state[y, left] + state[down, left]
+                        + state[up, x] + state[down, x] + state[y, right])
+                    out[y, x] = NEXT_STATE[(state[y, x] << 3) | n]
+            else:
+                for x in range(W):
+                    left = x - 1 if x > 0 else W - 1
+                    right = x + 1 if x < W - 1 else 0
+                    n = (state[y, left] + state[up, x] + state[down, x]
+                        + state[up, right] + state[y, right] + state[down, right])
+                    out[y, x] = NEXT_STATE[(state[y, x] << 3) | n]
+else:
+    hex_step = bitboard_step
+
+
+def pack_rows(state):
+    """Returns `state` packed with one bit per cell into np.uint64 words, where
+    cell [y, x] is bit x % 64 of word [y, x // 64]. Bits past the last column
+    are left as 0.
+    """
+    H, W = state.shape
+    packed = np.packbits(state, axis=1, bitorder='little')
+    if W % 64 == 0: # Rows are already whole words, so view them as they are
+        return packed.view('<u8')
+
+    padded = np.zeros((H, 8 * -(-W // 64)), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view('<u8')
+
+
+def unpack_rows(rows, W):
+    """Inverse of pack_rows(); returns np.uint8 array of shape (H, W)."""
+    return np.unpackbits(rows.view(np.uint8), axis=1, count=W, bitorder='little')
+
+
+def shift_from_left(rows, W):
+    """Returns bitboards where cell x holds what cell x-1 of `rows` held, 
+    wrapping around over a row of `W` cells."""
+    shifted = rows << np.uint64(1)
+    # Carry the top bit of each word into the bottom bit of the next word
+    shifted[:, 1:] |= rows[:, :-1] >> np.uint64(63)
+    shifted[:, 0] |= (rows[:, -1] >> np.uint64((W - 1) % 64)) & np.uint64(1)
+    # Drop whatever was pushed past the last column
+    shifted[:, -1] &= np.uint64(2**(((W - 1) % 64) + 1) - 1)
+    return shifted
+
+
+def shift_from_right(rows, W):
+    """Returns bitboards where cell x holds what cell x+1 of `rows` held, 
+    wrapping around over a row of `W` cells."""
+    shifted = rows >> np.uint64(1)
+    # Carry the bottom bit of each word into the top bit of the previous word
+    shifted[:, :-1] |= rows[:, 1:] << np.uint64(63)
+    shifted[:, -1] |= (rows[:, 0] & np.uint64(1)) << np.uint64((W - 1) % 64)
+    return shifted
+
+
+def full_add(a, b, c):
+    """Adds bit planes `a`, `b` and `c` bitwise, returning (sum, carry)."""
+    a_xor_b = a ^ b
+    return a_xor_b ^ c, (a & b) | (a_xor_b & c)
+
+
+def step(state, out=None):
+    """Returns the next frame of `state` (see hex_step()), written into `out` 
+    if it's given, otherwise into a new array."""
+    if out is None:
+        out = np.empty_like(state)
+    hex_step(state, out)
+    return out
+
+
+# Canvas tags given to each Hexagon's polygon and label, indexed by state, so
+# all Hexagons of one state can be recoloured with a single itemconfig
+FILL_TAGS = ('dead_hex', 'alive_hex')
+TEXT_TAGS = ('dead_text', 'alive_text')
+# Canvas tag of the lines tracing the edges of the Hexagons, see draw_borders()
+BORDER_TAG = 'border'
+
+# Vertices of a Hexagon with r=1 centred on (0, 0), going round and back to
+# the first one. + pi/6 to rotate slightly
+UNIT_VERTICES = np.array([
+    (cos(pi/6 + angle_index * pi/3), sin(pi/6 + angle_index * pi/3))
+    for angle_index in range(7)
+])
+
+# Indices into UNIT_VERTICES taking a line from a Hexagon's upper-left vertex 
+# all the way round it, then on along its top edges to its upper-right vertex,
+# which is the upper-left vertex of the next Hexagon in the row
+BORDER_ORDER = [4, 5, 0, 1, 2, 3, 4, 5]
+
+
+def get_second_r(r):
+    """The perpendciular distance from the centre to any of a hex's edges."""
+    return r * sin(pi/3)
+
+
+def get_side_length(r):
+    """The length of each of a hex's edges. A regular hexagon is made of 6
+    equilateral triangles, so this is just r."""
+    return r
+
 
 class Grid():
-    """Grid is a container for a grid of Hexagon objects as well as an 
-    associated GUI for interacting with these Hexagons.
+    """Grid is a grid of Hexagons as well as an associated GUI for interacting
+    with them. There are no per-Hexagon objects: each Hexagon is a cell [y, x] 
+    of the grid's arrays (its state, count and canvas items), so the game's 
+    logic and the drawing both work on whole arrays at once.
     
     When a Grid is instantiated, it will automatically display itself.
     """
     def __init__(self):
         """Sets up the window and all its frames, as well as drawing all the 
         Hexagons on the canvas, and calling mainloop() to keep window open."""
-        # Keeping track of if currently animating or not
+        # Keeping track of if currently animating or not, and of the next 
+        # frame scheduled with window.after() so it can be cancelled
         self.running = False
-
-        # Dict where we will store all hexagons in Grid
-        self.hexes = {}
+        self.next_frame = None
+
+        self.start_stepper()
+
+        # Arrays holding the state and live neighbour count of every Hexagon,
+        # indexed by [y, x]. These are what the game's logic works on, the
+        # canvas items are just there to show them.
+        self.state = np.zeros((0, 0), dtype=np.uint8)
+        self.count = np.zeros((0, 0), dtype=np.uint8)
+        self.pixel_xs = np.zeros((0, 0))
+        self.pixel_ys = np.zeros((0, 0))
+        # self.state is never written to in place, a new state replaces it 
+        # whole (see set_states()). The array it replaces is kept here to
+        # write the frame after into, so frames don't allocate, see 
+        # take_back_buffer().
+        self.back = None
+        # Canvas item ids of each Hexagon's polygon and label (0 while it has
+        # no label)
+        self.item_handles = np.zeros((0, 0), dtype=np.int32)
+        self.text_handles = np.zeros((0, 0), dtype=np.int32)
+        # Number of living Hexagons, kept up to date by update_counts() so the
+        # label never has to count the whole grid
+        self.n_living = 0
 
         # Set up window, make widgets and draw the grid of Hexagons to canvas
         self.window = tk.Tk()
         self.window.title("Hexagonal Game of Life")
         self.make_widgets()
+        self.change_colour_scheme()
         self.canvas.update()
+        self.measure_grid()
         self.draw_grid()
 
         self.window.mainloop()
 
+    def start_stepper(self):
+        """Starts the thread every frame is worked out on and warms up 
+        hex_step() on it.
+
+        Sets
+        ----
+        self.stepper: concurrent.futures.ThreadPoolExecutor
+            While animating, the next frame is worked out on its one thread as
+            soon as the current one is drawn, see prefetch_next_state(). Every
+            step runs on this thread, so hex_step() is never called from two
+            threads at once.
+        self.prefetched: None
+            See prefetch_next_state().
+        self.warm_up: concurrent.futures.Future
+            The first call to a Numba kernel compiles it (or loads it from the
+            cache), so that's got out of the way in the background while the
+            window is being set up, rather than on the first frame. It runs on
+            self.stepper like any other step, so it's the threading layer 
+            picked at the top of the module that makes this safe: the process
+            can still exit afterwards, and the first real step queues behind 
+            it rather than running alongside it. If compiling fails, the first
+            step raises it, see submit_step().
+        """
+        self.stepper = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.prefetched = None
+        self.warm_up = self.stepper.submit(step, np.zeros((2, 1), dtype=np.uint8))
+
     def resize_grid(self):
         """Delete any Hexagons which are no longer within the window/canvas 
         (window is shrunk) and draw any new Hexagons if they can now fit in the
         window/canvas (window has been made bigger).
         """
-        poses_to_pop = []
-        for pos, hex in self.hexes.items():
-            if hex.is_out_of_bounds():
-                hex.delete_from_canvas()
-                poses_to_pop.append(pos)
-            
-        for pos in poses_to_pop:
-            self.hexes.pop(pos)
+        self.measure_grid()
+
+        # Everything past the new bounds has to go. The handle arrays haven't
+        # been resized yet, so they still cover every Hexagon drawn so far.
+        # measure_grid() keeps the new shape from going negative, which would
+        # slice everything but the last rows/columns instead
+        h, w = self.max_y_coord + 1, self.max_x_coord + 1
+        out_of_bounds = np.ones(self.item_handles.shape, dtype=bool)
+        out_of_bounds[:h, :w] = False
+        text_handles = self.text_handles[out_of_bounds]
+        self.canvas.delete(*self.item_handles[out_of_bounds].tolist(), 
+            *text_handles[text_handles != 0].tolist())
 
         self.draw_grid()
-        self.refresh_counts()
         self.refresh_texts()
+        self.refresh_living_count()
 
     def make_widgets(self):
         """Makes:
@@ -140,12 +421,12 @@ class Grid():
         self.colour_scheme.set('Default')       
 
         self.colour_menu = tk.Menu(self.menubar, tearoff = 0)
-        for colour_scheme in COLOUR_SCHEMES.keys():
+        for colour_scheme in COLOUR_SCHEMES:
             self.colour_menu.add_radiobutton(
                 label=colour_scheme,
                 variable=self.colour_scheme,
                 value=colour_scheme,
-                command=self.refresh_all
+                command=self.change_colour_scheme
                 )
 
         self.menubar.add_cascade(label="Colour", menu = self.colour_menu)
@@ -196,6 +477,10 @@ class Grid():
         self.canvas = tk.Canvas(master=self.mid_frame, highlightthickness=0, height=700) # f*** highlightthickness
         self.canvas.pack(fill=tk.BOTH, expand=True)
         self.canvas.update()
+        # Every polygon and label has one of these tags, so this is the only 
+        # binding needed (rather than one per canvas item), see on_click()
+        for tag in FILL_TAGS + TEXT_TAGS:
+            self.canvas.tag_bind(tag, '<Button-1>', self.on_click)
 
         ############# BOTTOM FRAME #############
         # Button to start/stop animation
@@ -231,6 +516,9 @@ class Grid():
 
         # Button to toggle whether to show live neighbour counts of hexagons
         self.do_show_count = tk.BooleanVar() # Default=False
+        # Plain bool copy of do_show_count, refreshed by refresh_texts() (the 
+        # checkbox's command), so drawing doesn't have to ask tkinter each time
+        self.show_count = False
         tk.Checkbutton(
             master=self.bottom_frame,
             text="Show count",
@@ -247,15 +535,30 @@ class Grid():
         tk.Label(self.bottom_frame, text="'r': ").pack(side=tk.LEFT)
 
         def change_r(event):
+            """Rescales the Hexagons once the slider has stayed put for a 
+            moment, rather than on every step it's dragged through."""
+            if self.pending_rescale is not None:
+                self.window.after_cancel(self.pending_rescale)
+            self.pending_rescale = self.window.after(100, rescale)
+
+        def rescale():
             """Scales all the Hexagons to new radius"""
+            self.pending_rescale = None
             old_r = self.previous_r
             new_r = self.r.get()
             scale_factor = new_r / old_r
             self.canvas.scale("all", 0, 0, scale_factor, scale_factor)
+            # Keep centres in line with the canvas for labels drawn later on
+            self.pixel_xs *= scale_factor
+            self.pixel_ys *= scale_factor
             self.previous_r = new_r
+            self.set_hex_size(new_r)
 
-        # Slider to adjust r of Hexagons
-        self.previous_r = 20 # For use when resizing Hexes
+        # Slider to adjust r of Hexagons. Until a change has been applied by 
+        # rescale(), the slider can be ahead of what's drawn, so the grid 
+        # works from previous_r (the r everything is drawn at) instead.
+        self.previous_r = 20
+        self.pending_rescale = None
         self.r = tk.Scale(master=self.bottom_frame,
             from_=10, to=50,
             resolution=1,
@@ -263,6 +566,7 @@ class Grid():
             command=change_r)
         self.r.pack(side=tk.LEFT)
         self.r.set(self.previous_r)
+        self.set_hex_size(self.previous_r)
 
         # Framerate limit Entry field
         self.fr_limit = tk.DoubleVar()
@@ -274,13 +578,142 @@ class Grid():
         # Frame rate limit label
         tk.Label(self.bottom_frame, text="Framerate Limit: ").pack(side=tk.RIGHT)
 
+    def set_hex_size(self, r):
+        """Caches the measurements of a Hexagon with radius `r`, which only
+        change when the 'r' slider moves.
+
+        Sets
+        ----
+        self.second_r: float
+            See get_second_r().
+        self.side_length: float
+            See get_side_length().
+        """
+        self.second_r = get_second_r(r=r)
+        self.side_length = get_side_length(r=r)
+
     def draw_grid(self):
-        """Draws grid of dead hexagons to start off with.
+        """Draws grid of dead hexagons to start off with, or any that haven't 
+        been drawn yet after resizing.
+
+        Sets
+        ----
+        self.item_handles[y, x]: int
+            A reference to each new Hexagon on the canvas so we can call 
+            .itemconfig() with it to change the Hex's colour, etc.
         """
-        for y in range(self.max_y_coord + 1):
-            for x in range(self.max_x_coord + 1):
-                if (x, y) not in self.hexes.keys(): # Only draw if not already drawn
-                    self.hexes[(x, y)] = Hexagon(grid=self, x=x, y=y)
+        self.resize_arrays()
+
+        # Every Hexagon is the same shape, just moved to its own centre, so get
+        # all their vertices at once from one unit hexagon; shape (H, W, 14)
+        r = self.previous_r
+        centres = np.stack([self.pixel_xs, self.pixel_ys], axis=-1)[:, :, None, :]
+        vertices = (centres + r * UNIT_VERTICES).reshape(self.state.shape + (14,))
+
+        # Only draw if not already drawn
+        colours = (self._dead_fill, self._alive_fill)
+        for y, x in np.argwhere(self.item_handles == 0).tolist():
+            state = self.state[y, x]
+            self.item_handles[y, x] = self.canvas.create_polygon(
+                *vertices[y, x].tolist(), fill=colours[state], 
+                outline="", tags=FILL_TAGS[state])
+        self.draw_borders()
+
+        # In case text should be displayed (for Hexagons created after __init__)
+        if self.show_count:
+            self.draw_labels()
+
+    def draw_borders(self):
+        """Redraws the edges of all the Hexagons as one line per row, rather 
+        than giving every polygon its own outline for Tk to stroke.
+
+        Each row's line goes round each of its Hexagons in turn (see 
+        BORDER_ORDER), so the edges Hexagons share are just drawn twice over.
+        Edges shared between rows are drawn by both rows' lines.
+        """
+        self.canvas.delete(BORDER_TAG)
+        if self.state.size == 0:
+            return
+
+        r = self.previous_r
+        centres = np.stack([self.pixel_xs, self.pixel_ys], axis=-1)[:, :, None, :]
+        # Shape (H, W * 16), plus the upper-left vertex of each row's first
+        # Hexagon to start from
+        points = (centres + r * UNIT_VERTICES[BORDER_ORDER]).reshape(len(centres), -1)
+        starts = centres[:, 0, 0] + r * UNIT_VERTICES[3]
+        for start, row in zip(starts.tolist(), points.tolist()):
+            self.canvas.create_line(*start, *row, fill=self._alive_fill, 
+                tags=BORDER_TAG)
+
+    def draw_labels(self):
+        """Draws the labels displaying live neighbour counts of any Hexagons 
+        that don't have one yet.
+
+        Sets
+        ----
+        self.text_handles[y, x]: int
+            Similarly to self.item_handles, a reference to the text displaying
+            how many live neighbours each Hexagon has. These are only drawn 
+            while the 'Show count' box is ticked, see refresh_texts().
+        """
+        missing = np.flatnonzero(self.text_handles == 0)
+        pixel_xs = self.pixel_xs.ravel()[missing].tolist()
+        pixel_ys = self.pixel_ys.ravel()[missing].tolist()
+        text_handles = self.text_handles.reshape(-1) # A view, so updates self.text_handles
+        for i, pixel_x, pixel_y in zip(missing.tolist(), pixel_xs, pixel_ys):
+            text_handles[i] = self.canvas.create_text((pixel_x, pixel_y), 
+                text="", tags=TEXT_TAGS[0])
+        self.refresh_labels(missing)
+
+    def on_click(self, event):
+        """Switches the state of the Hexagon (or label) that was clicked on, 
+        and updates the counts that depend on it."""
+        item = self.canvas.find_withtag('current')[0]
+        index = np.flatnonzero((self.item_handles == item) | (self.text_handles == item))
+        new_state = self.state.copy()
+        new_state.reshape(-1)[index] ^= 1
+        self.set_states(new_state)
+
+    def resize_arrays(self):
+        """Resizes self.state, self.count, self.item_handles and 
+        self.text_handles to fit the current canvas, keeping those of any 
+        Hexagons that still fit. Counts of kept Hexagons are left as they were,
+        so call refresh_counts() (which refresh_texts() does) once the grid is
+        drawn.
+
+        Also sets
+        ---------
+        self.pixel_xs, self.pixel_ys: np.ndarray of floats, shape (H, W)
+            The pixel coordinates of the centre of each Hexagon at the current
+            'r', indexed by [y, x] like self.state.
+        self.neighbour_idx: np.ndarray of np.int32, shape (H, W, 6)
+            Flat indices into self.state.ravel() of each Hexagon's neighbours,
+            see neighbour_indices().
+        """
+        shape = (self.max_y_coord + 1, self.max_x_coord + 1)
+        h = min(shape[0], self.state.shape[0])
+        w = min(shape[1], self.state.shape[1])
+
+        def resized(array):
+            new_array = np.zeros(shape, dtype=array.dtype)
+            new_array[:h, :w] = array[:h, :w]
+            return new_array
+
+        self.state = resized(self.state)
+        self.count = resized(self.count)
+        self.item_handles = resized(self.item_handles)
+        self.text_handles = resized(self.text_handles)
+        self.n_living = int(np.count_nonzero(self.state))
+        self.back = None
+
+        # Odd rows are shifted right by half a Hexagon (i.e. by second_r)
+        r = self.previous_r
+        l = self.second_r
+        ys, xs = np.indices(shape)
+        self.pixel_xs = l * (2 * xs + 1 + ys % 2)
+        self.pixel_ys = r + ys * (r + 0.5 * self.side_length)
+
+        self.neighbour_idx = neighbour_indices(shape)
 
     def toggle_animation(self):
         """Switches animation from off to on and vice versa."""
@@ -290,26 +723,45 @@ class Grid():
             self.stop()
 
     def animate(self):
-        """Animates the grid."""
+        """Animates the grid. Each frame is scheduled on tkinter's event loop
+        with window.after(), so the window stays responsive between frames.
+        """
         self.running = True
         self.toggle_animation_text.set("Stop")
 
         # Getting duration of each frame at framerate
-        expected_frame_length = 1 / self.fr_limit.get()
-
-        # In case any cells have changed states
-        while self.running:
-            frame_start = time.time()
-            self.update()
-            frame_end = time.time()
-            actual_frame_length = frame_end - frame_start
-            if actual_frame_length < expected_frame_length:
-                self.window.after(floor(1000 * (expected_frame_length - actual_frame_length))) # stops input annoyingly
+        self.expected_frame_length = 1 / self.fr_limit.get()
+        self.next_frame_due = time.monotonic()
+        self.tick()
+
+    def tick(self):
+        """Updates the grid by one frame, then schedules the next frame so 
+        that frames are at most self.fr_limit per second.
+
+        Frames are due every self.expected_frame_length seconds from when 
+        animation started (by time.monotonic(), which can't jump like 
+        time.time()), so rounding the delay to whole milliseconds doesn't add 
+        up and slow the framerate down.
+        """
+        self.next_frame = None
+        self.next_frame_due += self.expected_frame_length
+        self.update()
+        if self.running:
+            self.prefetch_next_state()
+            now = time.monotonic()
+            # Running late, so don't rush the next frames to catch up
+            self.next_frame_due = max(self.next_frame_due, now)
+            delay = self.next_frame_due - now
+            self.next_frame = self.window.after(round(1000 * delay), self.tick)
 
     def stop(self):
         """Stops animation and resets text on start/stop button."""
         self.running = False
         self.toggle_animation_text.set("Start")
+        if self.next_frame is not None:
+            self.window.after_cancel(self.next_frame)
+            self.next_frame = None
+        self.prefetched = None
 
     def randomise(self):
         """Randomly sets hexes to being alive.
@@ -322,342 +774,358 @@ class Grid():
             that will become alive.
         """
         self.stop()
-        for hex in self.hexes.values():
-            dice_roll = random.random()
-            if dice_roll <= self.randomise_p.get():
-                hex.state = 1
-            else:
-                hex.state = 0
+        dice_rolls = np.random.random(self.state.shape)
+        self.set_states((dice_rolls < self.randomise_p.get()).astype(np.uint8))
 
     def clear(self):
         """Clears grid of living hexagons; resets all hexagons to dead."""
-        for hex in self.hexes.values():
-            hex.state = 0
+        self.set_states(np.zeros_like(self.state))
+
+    def set_states(self, new_state):
+        """Sets the states of all Hexagons at once, then updates neighbour
+        counts and the living count. Only Hexagons whose state actually 
+        changes are redrawn.
+
+        Parameters
+        ----------
+        new_state: np.ndarray of np.uint8, same shape as self.state
+            1 where a Hexagon should be alive, 0 where it should be dead.
+
+        Returns
+        -------
+        flipped: np.ndarray of ints
+            Flat indices (see self.neighbour_idx) of the Hexagons that changed.
+        """
+        flipped = np.flatnonzero(new_state != self.state)
+        # Nothing to redraw or recount (e.g. a still life)
+        if flipped.size == 0:
+            self.back = new_state
+            return flipped
+
+        # Swap rather than copy, and reuse the old state's memory next frame
+        self.state, self.back = new_state, self.state
+        # Labels are left to update_counts(), once their counts are right too
+        self.refresh_fills(flipped)
+
+        self.update_counts(flipped)
+        self.refresh_living_count()
+        return flipped
 
     def update(self):
         """Updates self by one frame according to the game's logic. To be used
         in self.animate().
         """       
-        altered_hexes = self.get_altered_hexes() 
+        flipped = self.set_states(self.get_next_state())
 
         # Stop animation if no more changes of state will occur
-        if len(altered_hexes) == 0:
+        if flipped.size == 0:
             self.stop()
-        else:
-            for hex in altered_hexes:
-                hex.switch_state()
 
-        self.canvas.update()
+    def change_colour_scheme(self):
+        """Caches the colours of the selected colour scheme, so Hexagons don't
+        have to look them up through self.colour_scheme every time they are
+        refreshed, then recolours everything with them.
 
-    def wrap_coords(self, x, y):
-        """Returns tuple of wrapped coordinates. I.e. if something goes out 
-        left of screen, it should come back out on the right, etc..
-        
-        Parameters
-        ----------
-        x, y: int
-            Coordinates of hexagon in Grid. This is NOT the pixel coordinates
-            of the hexagon's centre.
+        Sets
+        ----
+        self._alive_fill, self._dead_fill: str
+            The 'alive' and 'dead' colours of the current colour scheme.
         """
-        # Get actual max coords used, in case screen has resized
-        current_max_x_coord = max([pos[0] for pos in self.hexes])
-        current_max_y_coord = max([pos[1] for pos in self.hexes])
-        if x > current_max_x_coord:
-            new_x = 0
-        elif x < 0:
-            new_x = current_max_x_coord
-        else:
-            new_x = x
-        if y > current_max_y_coord:
-            new_y = 0
-        elif y < 0:
-            new_y = current_max_y_coord
-        else:
-            new_y = y
-
-        return (new_x, new_y)
+        scheme = COLOUR_SCHEMES[self.colour_scheme.get()]
+        self._alive_fill = scheme['alive']
+        self._dead_fill = scheme['dead']
+        self.refresh_all()
 
     def refresh_all(self):
-        for hex in self.hexes.values():
-            hex.refresh()
+        """Recolours all Hexagons and their labels for the current colour 
+        scheme. Hexagons are tagged by state (see FILL_TAGS), so this is one
+        itemconfig per state rather than one per Hexagon.
+        """
+        for state, tag in enumerate(FILL_TAGS):
+            fill_colour = self._alive_fill if state == 1 else self._dead_fill
+            self.canvas.itemconfig(tag, fill=fill_colour)
+        self.canvas.itemconfig(BORDER_TAG, fill=self._alive_fill)
+        self.refresh_texts()
 
     def refresh_texts(self):
         """Refreshes the labels on the hexagons showing how many live 
-        neighbours they have.
-        """
-        for hex in self.hexes.values():
-            hex.refresh_text()
+        neighbours they have. Labels are only kept on the canvas while 'Show
+        count' is ticked, so this draws any that are missing when it is, and
+        deletes them all when it isn't.
 
-    def refresh_counts(self):
-        for hex in self.hexes.values():
-            hex.refresh_count()
+        Labels are recoloured with one itemconfig per state tag (see 
+        TEXT_TAGS).
 
-    def get_altered_hexes(self):
-        """Returns list of hexes that will change state from this frame to the 
-        next.
-        """
-        altered_hexes = []
-        for hex in self.hexes.values():
-            count = hex.count
-            # Really the main logic of the game
-            if (count < 2 or count > 3) and hex.state == 1:
-                altered_hexes.append(hex)
-            elif count == 3 and hex.state == 0:
-                altered_hexes.append(hex)
-
-        return altered_hexes
-
-    @property
-    def max_x_coord(self):
-        """The maximum allowable x coordinate of a Hexagon on this Grid. Note,
-        this is NOT the maximum pixel coordinate."""
-        l = Hexagon.get_second_r(r=self.r.get())
-        return int((self.canvas.winfo_width()) / (2 * l) - 1)
-
-    @property
-    def max_y_coord(self):
-        """The maximum allowable y coordinate of a Hexagon on this Grid. Note,
-        this is NOT the maximum pixel coordinate.
-        
-        How it's calculated
-        -------------------
-        Total height for n canvases given by:
-            t0 = 2r
-            d = 0.5l + r
-            Therefore,
-            tn = 2r + n(0.5l + r)
-            Therefore,
-            n = (tn - 2r) ÷ (0.5l + r)
+        Sets
+        ----
+        self.show_count: bool
+            The current value of self.do_show_count.
         """
-        r = self.r.get()
-        l = Hexagon.get_second_r(r=self.r.get())
-        h = self.canvas.winfo_height()
-        y = floor((h - 2*r) / (0.5*l + r))
+        self.show_count = self.do_show_count.get()
+        if self.show_count == False:
+            self.canvas.delete(*TEXT_TAGS)
+            self.text_handles[...] = 0
+            return
 
-        # Prevents error when wrapping coordinates vertically. Imagine you have
-        # 3 rows. The bottom row will take up the same horizontal positions as
-        # the first. When wrapping, the bottom row's neighbours will somehow
-        # become part of the top row, even though they would not really be 
-        # adjacent, leading to negative live neighbour counts.
-        if y % 2 == 0:
-            return y - 1
-        return y   
+        # Counts aren't kept up to date while labels are hidden
+        self.refresh_counts()
+        self.draw_labels()
+        for state, tag in enumerate(TEXT_TAGS):
+            label_colour = self._dead_fill if state == 1 else self._alive_fill
+            self.canvas.itemconfig(tag, fill=label_colour)
 
+    def refresh_counts(self):
+        """Recounts the live neighbours of every Hexagon from self.state and
+        refreshes the labels of those whose count has changed.
+        """
+        count = self.state.ravel()[self.neighbour_idx].sum(axis=2, dtype=np.uint8)
+        changed = np.flatnonzero(count != self.count)
+        self.count = count
+        self.refresh_labels(changed)
 
-class Hexagon():
-    """A hexagon which is drawn on the given Grid object.
+    def refresh_fills(self, indices):
+        """Recolours the Hexagons at `indices` for their current states, and
+        moves them to the tag for that state (see FILL_TAGS).
 
-    Parameters
-    ----------
-    grid: Grid
-        A Grid object which will contain many Hexagons
-    x, y: int
-        The coordinates of the Hexagon in `grid`. NOT its literal pixel 
-        coordinates in the tkinter canvas.
-    """
-    def __init__(self, grid, x, y):
-        self.x = x
-        self.y = y
-        self.grid = grid
-        # self.r = grid.r.get()
-        self.canvas = grid.canvas
-        self.count = 0 # The number of neighbours that are alive
-        self.draw()
+        Parameters
+        ----------
+        indices: np.ndarray of ints
+            Flat indices (see self.neighbour_idx) of the Hexagons to refresh.
+        """
+        # Options only depend on state, so format them once per state
+        colours = (self._dead_fill, self._alive_fill)
+        options = [f"-fill {{{colours[state]}}} -tags {tag}" 
+            for state, tag in enumerate(FILL_TAGS)]
+        handles = self.item_handles.ravel()[indices].tolist()
+        states = self.state.ravel()[indices].tolist()
+        self.itemconfigure_many(handles, [options[state] for state in states])
+
+    def refresh_labels(self, indices):
+        """Refreshes the count and colour of the labels of the Hexagons at 
+        `indices`, and moves them to the tag for their state (see 
+        TEXT_TAGS). Hexagons without a label are skipped.
 
-    def __repr__(self):
-        return f"Hexagon{self.x, self.y, self.state}"
+        Parameters
+        ----------
+        indices: np.ndarray of ints
+            Flat indices (see self.neighbour_idx) of the Hexagons to refresh.
+        """
+        handles = self.text_handles.ravel()[indices]
+        drawn = handles != 0
+        indices = np.asarray(indices)[drawn]
+        if indices.size == 0:
+            return
+
+        # Labels are the opposite colour to their Hexagon
+        colours = (self._alive_fill, self._dead_fill)
+        options = [f"-fill {{{colours[state]}}} -tags {tag}" 
+            for state, tag in enumerate(TEXT_TAGS)]
+        states = self.state.ravel()[indices].tolist()
+        counts = self.count.ravel()[indices].tolist()
+        self.itemconfigure_many(handles[drawn].tolist(), 
+            [f"-text {count} {options[state]}" for state, count in zip(states, counts)])
+
+    def itemconfigure_many(self, handles, options):
+        """Configures many canvas items with a single Tcl script, rather than
+        going from Python to Tcl and back once per item with 
+        canvas.itemconfig().
 
-    @property
-    def r(self):
-        return self.grid.r.get()
+        Parameters
+        ----------
+        handles: list of ints
+            Canvas item ids.
+        options: list of str
+            The Tcl options (e.g. "-fill black") to give each item in 
+            `handles`.
+        """
+        canvas = str(self.canvas)
+        self.canvas.tk.eval("\n".join(f"{canvas} itemconfigure {handle} {option}" 
+            for handle, option in zip(handles, options)))
+
+    def update_counts(self, flipped):
+        """Updates neighbour counts after the Hexagons at `flipped` have 
+        switched state, without recounting the whole grid: each one that came 
+        to life adds 1 to its 6 neighbours' counts, and each one that died 
+        takes 1 away. Also updates self.n_living. If labels are shown, 
+        relabels the neighbours whose counts were touched and the flipped 
+        Hexagons themselves (whose label colours have changed), once each.
+
+        Counts are only needed for the labels (step() counts for itself), so
+        while labels are hidden they're left stale. refresh_texts() recounts 
+        when they come back.
 
-    def draw(self):
-        """Draws Hexagon on canvas and makes it clickable.
+        Parameters
+        ----------
+        flipped: np.ndarray of ints
+            Flat indices (see self.neighbour_idx) of Hexagons that have just 
+            switched state. self.state must already hold their new states.
+        """
+        born = self.state.reshape(-1)[flipped] == 1
+        self.n_living += 2 * int(np.count_nonzero(born)) - born.size
+        if self.show_count == False:
+            return
+
+        count = self.count.reshape(-1) # A view, so updates self.count
+        neighbours = self.neighbour_idx.reshape(-1, 6)[flipped]
+        np.add.at(count, neighbours[born].ravel(), 1)
+        np.subtract.at(count, neighbours[~born].ravel(), 1)
+        self.refresh_labels(np.union1d(neighbours, flipped))
+
+    def refresh_living_count(self):
+        """Sets the displayed number of living Hexagons from self.n_living."""
+        self.living_count.set(self.n_living)
+
+    def get_next_state(self):
+        """Returns array of what self.state will be in the next frame. Uses
+        the one from prefetch_next_state() if it was started from what 
+        self.state is now.
+        """
+        if self.prefetched is not None:
+            source, future = self.prefetched
+            self.prefetched = None
+            # Hexagons may have been clicked, the grid resized, etc. since, in
+            # which case self.state has been replaced. The worker might still
+            # be going, but it only writes to a buffer nothing else has now.
+            if source is self.state:
+                return future.result()
+
+        # Really the main logic of the game. This goes through self.stepper
+        # too, so it waits for a stale prefetch to finish rather than running
+        # alongside it: Numba's workqueue threading layer (see the top of the
+        # module) aborts the process if a parallel kernel is called from two
+        # threads at once.
+        return self.submit_step().result()
+
+    def prefetch_next_state(self):
+        """Starts working out the next frame on self.stepper's thread, so 
+        it's (hopefully) ready by the time get_next_state() is called. Only 
+        tkinter calls have to happen on the main thread. self.state is never
+        written to in place, so the worker can read it without copying.
 
         Sets
         ----
-        self.item_handle: tkinter.Canvas() item
-            A reference to the Hexagon on the canvas so we can call 
-            .itemconfig() with self.item_handle to change the Hex's colour, etc.
-        self.text_handle: tkinter.Canvas() item
-            Similarly, a reference to the text displaying how many live 
-            neighbours a Hexagon has.
+        self.prefetched: tuple of (np.ndarray, concurrent.futures.Future)
+            The state the prefetch started from and the future of its next 
+            frame.
         """
-        points = []
-        for angle_index in range(7): 
-            angle = pi/6 + angle_index * pi/3 # + pi/6 to rotate slightly
-            point = [self.pixel_x + self.r * cos(angle), self.pixel_y + self.r * sin(angle)] 
-            points.extend(point)
-
-        # Just to handle the event parameter
-        def switch_state_cb(event):
-            self.switch_state()
-
-        fill_colour = COLOUR_SCHEMES[self.grid.colour_scheme.get()]['dead']
-        outline_colour = COLOUR_SCHEMES[self.grid.colour_scheme.get()]['alive']
-
-        # Draw hexagon and bind mouse click on it to switch state
-        self.item_handle = self.canvas.create_polygon(*points, fill=fill_colour, outline=outline_colour)
-        self.canvas.tag_bind(self.item_handle, '<Button-1>', switch_state_cb)
-        self.refresh_fill() # In case of different colour scheme
-
-        # Draw text displaying live neighbour count and also bind it
-        self.text_handle = self.canvas.create_text((self.pixel_x, self.pixel_y), text="")
-        self.canvas.tag_bind(self.text_handle, '<Button-1>', switch_state_cb)
-        # In case text should be displayed (for Hexagons created after __init__)
-        self.refresh_text() 
+        self.prefetched = (self.state, self.submit_step())
+
+    def submit_step(self):
+        """Submits working out the next frame of self.state to self.stepper,
+        and returns its future.
 
-    def refresh(self):
-        """Refreshes fill of Hexagon and its text."""
-        self.refresh_fill()
-        self.refresh_text()
+        The first call waits for the warm-up started in __init__() and 
+        re-raises anything that went wrong in it (e.g. Numba failing to 
+        compile hex_step()), rather than it being lost with the future.
+        """
+        if self.warm_up is not None:
+            warm_up, self.warm_up = self.warm_up, None
+            warm_up.result()
+        return self.stepper.submit(step, self.state, self.take_back_buffer())
+
+    def take_back_buffer(self):
+        """Returns self.back for the next frame to be written into, if it's 
+        the right shape, otherwise None (leaving step() to make a new one). 
+        Either way, it's no longer kept in self.back, so it can't be handed 
+        out twice.
+        """
+        back, self.back = self.back, None
+        if back is not None and back.shape == self.state.shape:
+            return back
+        return None
 
-    def refresh_fill(self):
-        """Refreshes fill of Hexagon based on colour scheme."""
-        fill_colour, _ = self.get_colours_from_state()
-        outline_colour = COLOUR_SCHEMES[self.grid.colour_scheme.get()]['alive']
-        self.canvas.itemconfig(self.item_handle, fill=fill_colour, outline=outline_colour)
+    def measure_grid(self):
+        """Works out how many Hexagons fit on the canvas at the current 'r'.
+        Only needs calling when the canvas or 'r' might have changed, i.e. 
+        before (re)drawing the grid.
 
-    def refresh_text(self):
-        """Refreshes the label showing how many live neighbours there are.
+        Sets
+        ----
+        self.max_x_coord: int
+            The maximum allowable x coordinate of a Hexagon on this Grid. Note,
+            this is NOT the maximum pixel coordinate.
+        self.max_y_coord: int
+            The maximum allowable y coordinate of a Hexagon on this Grid. Note,
+            this is NOT the maximum pixel coordinate.
         
-        Note, this does NOT update the canvas or check that the current
-        neighbour count is accurate (which may not be so when clearing, 
-        randomising grid, etc.).
+        How max_y_coord is calculated
+        -------------------
+        Total height for n canvases given by (s being a side length):
+            t0 = 2r
+            d = 0.5s + r
+            Therefore,
+            tn = 2r + n(0.5s + r)
+            Therefore,
+            n = (tn - 2r) ÷ (0.5s + r)
         """
-        if self.grid.do_show_count.get() == False:
-            label_colour = ""
-        else:
-            # Ignore first value returned in tuple
-            _, label_colour = self.get_colours_from_state()
-        self.canvas.itemconfig(self.text_handle, fill=label_colour, text=self.count)
-
-    def refresh_count(self):
-        """Refreshes count of live neighbours. Useful when canvas is resized."""
-        count = 0
-        for neighbour in self.neighbours:
-            count += neighbour.state
-        self.count = count
+        r = self.previous_r
+        l = self.second_r
+        # Never less than -1, i.e. no columns, even if the canvas is too 
+        # narrow for a single Hexagon
+        self.max_x_coord = max(int((self.canvas.winfo_width()) / (2 * l) - 1), -1)
 
-    def delete_from_canvas(self):
-        """Deletes the Hexagon and its associated text from canvas"""
-        self.grid.canvas.delete(self.item_handle) # Delete Hexagon from canvas
-        self.grid.canvas.delete(self.text_handle) # Delete text from canvas
-
-    @property
-    def state(self):
-        """Whether hexagon is alive (1) or dead (0). Defaults to 0."""
-        try:
-            return self.__state
-        except AttributeError:
-            # Defaults to 0
-            self.__state = 0
-            return self.__state
-
-    @state.setter
-    def state(self, new_state):
-        """Sets self.__state and adjusts fill colour of hexagon accordingly.
-        Also updates the `count`s of neighbours, as well as the global count
-        of how many living Hexagons there are.
-        """
-        # Get current state, then set to `new_state`
-        current_state = self.state
-        self.__state = new_state
-
-        # Refresh visuals of Hexagon if req.
-        if new_state != current_state:
-            self.refresh()
-
-        # Update global living count
-        increment = new_state - current_state
-        self.grid.living_count.set(self.grid.living_count.get() + increment)
-
-        # Update neighbours `count`s
-        for neighbour in self.neighbours:
-            neighbour.count += increment
-            neighbour.refresh_text() # Needed to ensure accurate counts for all Hexes
-
-    def switch_state(self):
-        """Switches state from dead to alive and vice versa"""
-        if self.state == 0:
-            self.state = 1
-        elif self.state == 1:
-            self.state = 0
-
-    @property
-    def second_r(self):
-        return Hexagon.get_second_r(r=self.r)
-
-    @property
-    def side_length(self):
-        return Hexagon.get_side_length(r=self.r)
-
-    @property
-    def pixel_x(self):
-        """Returns pixel x coordinate based on hex's grid coordinates"""
-        if self.y % 2 == 0:
-            return self.second_r * (2 * self.x + 1)
-        else:
-            return self.second_r * (2 * self.x + 2)
-
-    @property
-    def pixel_y(self):
-        """Returns pixel y coordinate based on hex's grid coordinates"""
-        return self.r + self.y * (self.r + 0.5 * self.side_length)
-
-    @property
-    def neighbours(self):
-        """Returns list of references to hex's neighbours in Grid."""
-        x, y = self.x, self.y
-        if y % 2 == 1:
-            neighbour_indices = [
-                (x-1, y  ),
-                (x  , y-1),
-                (x  , y+1),
-                (x+1, y-1),
-                (x+1, y  ),
-                (x+1, y+1)
-            ]
-        else:
-            neighbour_indices = [
-                (x-1, y-1),
-                (x-1, y  ),
-                (x-1, y+1),
-                (x  , y-1),
-                (x  , y+1),
-                (x+1, y  )
-            ]
-
-        # Gets references to Hexagons in grid, wrapping coords if necessary
-        return [self.grid.hexes[self.grid.wrap_coords(*i)] for i in neighbour_indices]
-
-    def is_out_of_bounds(self):
-        """Return True if Hexagon cannot fit on Canvas, False if not"""
-        if self.x > self.grid.max_x_coord or self.y > self.grid.max_y_coord:
-            return True
-
-    @staticmethod
-    def get_second_r(r):
-        """The perpendciular distance from the centre to any of the hex's edges."""
-        return r * sin(pi/3)
-
-    @staticmethod
-    def get_side_length(r):
-        a = pi/3
-        return sqrt((r - cos(a))**2 + (0 - sin(a))**2)
-
-    def get_colours_from_state(self):
-        """Returns tuple of (fill_colour, label_colour) based on state"""
-        alive = COLOUR_SCHEMES[self.grid.colour_scheme.get()]['alive']
-        dead = COLOUR_SCHEMES[self.grid.colour_scheme.get()]['dead']
-        if self.state == 0:
-            return (dead, alive)
-        elif self.state == 1:
-            return (alive, dead)
+        h = self.canvas.winfo_height()
+        y = floor((h - 2*r) / (0.5*self.side_length + r))
+
+        # Prevents error when wrapping coordinates vertically. Imagine you have
+        # 3 rows. The bottom row will take up the same horizontal positions as
+        # the first. When wrapping, the bottom row's neighbours will somehow
+        # become part of the top row, even though they would not really be 
+        # adjacent, leading to negative live neighbour counts.
+        if y % 2 == 0:
+            y -= 1
+        # Likewise, no rows if the canvas is too short for one
+        self.max_y_coord = max(y, -1)
+
+
+@contextlib.contextmanager
+def run_banner(name_of_script):
+    """Logs the script starting and finishing at DEBUG level, so there's 
+    nothing to write on a normal run, and logs the exception if it fails."""
+    logger.debug("Started running %s", name_of_script)
+    try:
+        yield
+    except Exception:
+        logger.exception("Failed running %s", name_of_script)
+        raise
+    logger.debug("Finished running %s", name_of_script)
+
+
+def main():
+    """Runs the game from the script's own directory, logging to a file named
+    after the script."""
+    # Change cwd to that of script. __file__ is almost always absolute 
+    # already, in which case there's no need for abspath() to ask for the cwd.
+    path_to_script = __file__ if os.path.isabs(__file__) else os.path.abspath(__file__)
+    dir_of_script, name_of_script = os.path.split(path_to_script)
+    os.chdir(dir_of_script)
+
+    # Strip the extension (i.e. '.py'), leaving names like '.hidden' alone
+    dot = name_of_script.rfind('.')
+    basename = name_of_script[:dot] if dot > 0 else name_of_script
+    # Naming log file same as script, only opened once something is logged
+    log_file = logging.FileHandler(basename + '.log', delay=True)
+    log_file.setFormatter(LOG_FORMATTER)
+    # Hold records in memory and write them out in batches, rather than 
+    # writing to the file for every one. Errors are still written straight away.
+    file_handler = logging.handlers.MemoryHandler(capacity=1024, 
+        flushLevel=logging.ERROR, target=log_file, flushOnClose=True)
+    atexit.register(file_handler.close)
+    # Logging just puts records on a queue, and file_handler deals with them
+    # on the listener's own thread. atexit runs in reverse, so the listener is
+    # stopped (handling anything still queued) before file_handler is closed.
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, file_handler, 
+        respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    with run_banner(name_of_script):
+        Grid()
 
 
 if __name__ == '__main__':
-    grid = Grid()
+    main()
 
 ############################## MAIN CODE ENDS HERE ##############################
-logger.info(msg=f"Finished running {os.path.basename(__file__)}")
\ No newline at end of file
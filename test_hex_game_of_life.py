@@ -0,0 +1,320 @@
+"""Checks both step backends against a brute-force count of each Hexagon's
+neighbours, and that a Grid's bookkeeping stays right as it's changed. Run 
+with `python -m pytest`.
+"""
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+import hex_game_of_life as hgol
+
+BACKENDS = [hgol.bitboard_step, hgol.hex_step]
+
+
+def reference_step(state):
+    """The next frame of `state`, one Hexagon at a time."""
+    H, W = state.shape
+    out = np.zeros_like(state)
+    for y in range(H):
+        offsets = (hgol.ODD_ROW_OFFSETS if y % 2 else hgol.EVEN_ROW_OFFSETS).tolist()
+        for x in range(W):
+            count = sum(state[(y + dy) % H, (x + dx) % W] for dx, dy in offsets)
+            alive = state[y, x] == 1
+            out[y, x] = count == 3 or (alive and count == 2)
+    return out
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("width", [1, 63, 64, 65, 128, 129])
+def test_step_matches_reference(backend, width):
+    rng = np.random.default_rng(width)
+    state = (rng.random((6, width)) < 0.4).astype(np.uint8)
+    for _ in range(3):
+        out = np.empty_like(state)
+        backend(state, out)
+        expected = reference_step(state)
+        np.testing.assert_array_equal(out, expected)
+        state = expected
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_step_empty_grid(backend):
+    state = np.zeros((6, 0), dtype=np.uint8)
+    out = np.empty_like(state)
+    backend(state, out)
+    assert out.shape == (6, 0)
+
+
+def run_script(script):
+    """Runs `script` in a new interpreter, failing if it doesn't exit."""
+    result = subprocess.run([sys.executable, "-c", textwrap.dedent(script)], 
+        cwd=os.path.dirname(os.path.abspath(__file__)), timeout=60)
+    assert result.returncode == 0
+
+
+def test_process_exits_after_stepping_off_main_thread():
+    # Grid steps on a worker thread, which mustn't stop the interpreter from
+    # exiting afterwards (it did with Numba's TBB threading layer)
+    run_script("""
+        import concurrent.futures
+        import numpy as np
+        import hex_game_of_life as hgol
+
+        stepper = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        stepper.submit(hgol.step, np.zeros((4, 4), dtype=np.uint8)).result()
+        """)
+
+
+def test_process_exits_after_warm_up():
+    # The warm-up runs even if animation is never started
+    run_script("""
+        import hex_game_of_life as hgol
+
+        grid = hgol.Grid.__new__(hgol.Grid)
+        grid.start_stepper()
+        grid.warm_up.result()
+        """)
+
+
+class StubVar():
+    """Stands in for a tk.Variable."""
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class StubCanvas():
+    """Stands in for a tk.Canvas of the given size, keeping track of which 
+    items exist and what text each label was last given."""
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.kinds = {} # Item id -> 'polygon', 'line' or 'text'
+        self.texts = {} # Label id -> count it shows
+        self.next_id = 1
+        self.current = None # The item "under the mouse", see find_withtag()
+        self.tk = self # For self.canvas.tk.eval()
+
+    def __str__(self):
+        return '.canvas'
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def create(self, kind):
+        item, self.next_id = self.next_id, self.next_id + 1
+        self.kinds[item] = kind
+        return item
+
+    def create_polygon(self, *args, **kwargs):
+        return self.create('polygon')
+
+    def create_line(self, *args, **kwargs):
+        return self.create('line')
+
+    def create_text(self, *args, **kwargs):
+        return self.create('text')
+
+    def delete(self, *items):
+        kinds = {hgol.BORDER_TAG: 'line'}
+        kinds.update(dict.fromkeys(hgol.FILL_TAGS, 'polygon'))
+        kinds.update(dict.fromkeys(hgol.TEXT_TAGS, 'text'))
+        for item in items:
+            if item in kinds: # A tag, so everything of that kind
+                for i in [i for i, kind in self.kinds.items() if kind == kinds[item]]:
+                    del self.kinds[i]
+            else:
+                del self.kinds[item] # KeyError if it was already deleted
+
+    def find_withtag(self, tag):
+        assert tag == 'current'
+        return (self.current,)
+
+    def itemconfig(self, *args, **kwargs):
+        pass
+
+    def eval(self, script):
+        # Only itemconfigure scripts, see Grid.itemconfigure_many()
+        for line in script.splitlines():
+            words = line.split()
+            item = int(words[2])
+            assert item in self.kinds
+            if '-text' in words:
+                self.texts[item] = int(words[words.index('-text') + 1])
+
+
+def make_grid(width=300, height=200, show_count=True):
+    """Returns a Grid drawn on a StubCanvas, set up like Grid.__init__() 
+    would but without a window."""
+    grid = hgol.Grid.__new__(hgol.Grid)
+    grid.running = False
+    grid.next_frame = None
+    grid.start_stepper()
+    # Numba's workqueue layer aborts if kernels run on two threads at once, 
+    # and tests step on the main thread too
+    grid.warm_up.result()
+    grid.state = np.zeros((0, 0), dtype=np.uint8)
+    grid.count = np.zeros((0, 0), dtype=np.uint8)
+    grid.pixel_xs = np.zeros((0, 0))
+    grid.pixel_ys = np.zeros((0, 0))
+    grid.back = None
+    grid.item_handles = np.zeros((0, 0), dtype=np.int32)
+    grid.text_handles = np.zeros((0, 0), dtype=np.int32)
+    grid.n_living = 0
+
+    grid.canvas = StubCanvas(width, height)
+    grid.living_count = StubVar(0)
+    grid.do_show_count = StubVar(show_count)
+    grid.show_count = show_count
+    grid.toggle_animation_text = StubVar("Start")
+    grid.previous_r = 20
+    grid.set_hex_size(grid.previous_r)
+    grid._alive_fill = 'black'
+    grid._dead_fill = 'white'
+    grid.measure_grid()
+    grid.draw_grid()
+    grid.refresh_texts()
+    return grid
+
+
+def assert_consistent(grid):
+    """Checks everything a Grid keeps up to date incrementally against what 
+    it would be worked out from scratch."""
+    assert grid.n_living == np.count_nonzero(grid.state)
+    assert grid.living_count.get() == grid.n_living
+    # One polygon per Hexagon, all still on the canvas
+    kinds = grid.canvas.kinds
+    assert grid.item_handles.shape == grid.state.shape
+    assert all(kinds[item] == 'polygon' for item in grid.item_handles.ravel().tolist())
+    assert list(kinds.values()).count('polygon') == grid.state.size
+
+    # Counts are only kept up to date while they're shown
+    if grid.show_count:
+        expected = grid.state.ravel()[grid.neighbour_idx].sum(axis=2)
+        np.testing.assert_array_equal(grid.count, expected)
+        labels = grid.text_handles.ravel().tolist()
+        assert all(kinds[label] == 'text' for label in labels)
+        assert list(kinds.values()).count('text') == grid.state.size
+        shown = [grid.canvas.texts[label] for label in labels]
+        np.testing.assert_array_equal(shown, expected.ravel())
+    else:
+        assert 'text' not in kinds.values()
+
+
+@pytest.mark.parametrize("width, height", [(300, 9), (0, 0), (10, 200), (300, 200)])
+def test_tiny_canvas(width, height):
+    grid = make_grid(width, height)
+    assert grid.state.shape == (grid.max_y_coord + 1, grid.max_x_coord + 1)
+    assert grid.max_y_coord >= -1 and grid.max_x_coord >= -1
+    assert_consistent(grid)
+
+
+@pytest.mark.parametrize("show_count", [True, False])
+def test_resize_keeps_hexagons_that_fit(show_count):
+    grid = make_grid(show_count=show_count)
+    rng = np.random.default_rng(0)
+    grid.set_states((rng.random(grid.state.shape) < 0.4).astype(np.uint8))
+    for width, height in [(200, 150), (300, 9), (0, 0), (400, 300), (250, 260)]:
+        old_state = grid.state
+        old_handles = grid.item_handles
+        grid.canvas.width, grid.canvas.height = width, height
+        grid.resize_grid()
+        assert_consistent(grid)
+
+        # Hexagons in both the old and new grid are kept as they were
+        h = min(old_state.shape[0], grid.state.shape[0])
+        w = min(old_state.shape[1], grid.state.shape[1])
+        np.testing.assert_array_equal(grid.state[:h, :w], old_state[:h, :w])
+        np.testing.assert_array_equal(grid.item_handles[:h, :w], old_handles[:h, :w])
+
+
+def test_set_states_updates_counts():
+    grid = make_grid()
+    rng = np.random.default_rng(1)
+    for p in [0.4, 0.1, 0.9, 0.4, 0]:
+        grid.set_states((rng.random(grid.state.shape) < p).astype(np.uint8))
+        assert_consistent(grid)
+    grid.clear()
+    assert_consistent(grid)
+    assert grid.n_living == 0
+
+
+def test_click_flips_one_hexagon():
+    grid = make_grid()
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        y = rng.integers(grid.state.shape[0])
+        x = rng.integers(grid.state.shape[1])
+        # Clicking a label is the same as clicking its Hexagon
+        handles = grid.item_handles if rng.random() < 0.5 else grid.text_handles
+        grid.canvas.current = int(handles[y, x])
+        old_state = grid.state.copy()
+        grid.on_click(None)
+        flipped = np.argwhere(grid.state != old_state).tolist()
+        assert flipped == [[y, x]]
+        assert_consistent(grid)
+
+
+def test_labels_recount_when_shown_again():
+    grid = make_grid()
+    rng = np.random.default_rng(3)
+    grid.set_states((rng.random(grid.state.shape) < 0.4).astype(np.uint8))
+    grid.do_show_count.set(False)
+    grid.refresh_texts()
+    for _ in range(5):
+        grid.set_states(hgol.step(grid.state))
+        assert_consistent(grid)
+    grid.do_show_count.set(True)
+    grid.refresh_texts()
+    assert_consistent(grid)
+
+
+@pytest.mark.parametrize("show_count", [True, False])
+def test_frames_match_reference(show_count):
+    grid = make_grid(show_count=show_count)
+    rng = np.random.default_rng(4)
+    grid.set_states((rng.random(grid.state.shape) < 0.4).astype(np.uint8))
+    buffers = set()
+    for frame in range(60):
+        before = grid.state.copy()
+        if frame % 3 == 0: # Like tick(), work out the next frame in advance
+            grid.prefetch_next_state()
+        if frame % 10 == 9: # A click makes the prefetch stale
+            grid.canvas.current = int(grid.item_handles[0, 0])
+            grid.on_click(None)
+            before = grid.state.copy()
+        grid.update()
+        np.testing.assert_array_equal(grid.state, reference_step(before))
+        assert_consistent(grid)
+        if frame >= 50:
+            buffers.add(id(grid.state))
+        if grid.state.sum() == 0: # Died out, start again
+            grid.set_states((rng.random(grid.state.shape) < 0.4).astype(np.uint8))
+
+    # Without clicks or resizes, frames go back and forth between two arrays
+    assert len(buffers) <= 2
+
+
+@pytest.mark.parametrize("datefmt", [None, '%H:%M', '%Y-%m-%d %H:%M:%S'])
+@pytest.mark.parametrize("msec_format", ['%s,%03d', '%s.%03d', None])
+def test_cached_time_formatter_matches_stdlib(datefmt, msec_format):
+    cached = hgol.CachedTimeFormatter("%(asctime)s:%(message)s", datefmt)
+    stdlib = logging.Formatter("%(asctime)s:%(message)s", datefmt)
+    cached.default_msec_format = stdlib.default_msec_format = msec_format
+    for created in [1000.25, 1000.75, 1001.5, 1000.25]:
+        record = logging.makeLogRecord({'msg': "hi", 'created': created, 
+            'msecs': (created % 1) * 1000})
+        assert cached.format(record) == stdlib.format(record)